@@ -5,15 +5,37 @@ import serial.tools.list_ports
 import math
 import time
 import threading
+import queue
 import datetime
 import os
+from collections import deque
 
 # ==========================================
 # CONFIGURATION
 # ==========================================
 DEFAULT_SERVO_PINS = [13, 14, 22, 23]
 BAUD_RATE = 115200
+# A write that cannot complete in this time (USB back-pressure) is dropped and retried
+WRITE_TIMEOUT = 0.05
 LOG_DIR = "logs"
+# Slider moves are coalesced for this long before being sent and displayed (0 = immediately)
+TX_COALESCE_MS = 8
+# Max frames waiting for the TX thread; when full the oldest is merged into the new one
+TX_QUEUE_SIZE = 64
+# Log lines are pushed to the UI in batches at most this often (ms)
+LOG_UI_FLUSH_MS = 100
+# "Servo N set to P" lines are merged and logged at most this often (ms)
+SERVO_LOG_MS = 500
+# Max lines waiting for the UI (older ones are dropped from the widget, not the file)
+LOG_UI_BUFFER = 500
+# The log widget keeps only the newest lines (the log file keeps everything)
+LOG_UI_MAX_LINES = 2000
+# comports() is slow (registry / udev scan), results are reused for this long (s)
+PORT_CACHE_TTL = 1.0
+# While connected, TX thread status (timeouts, errors) is picked up this often (ms)
+TX_STATUS_POLL_MS = 100
+# Pre-encoded "sN-" command prefixes, one per servo
+SERVO_CMD_PREFIXES = [f"s{i+1}-".encode() for i in range(len(DEFAULT_SERVO_PINS))]
 
 # Robot Geometry Constants (mm) derived from V4 code
 # Adjust these to match physical measurements exactly
@@ -36,6 +58,20 @@ NEUTRAL = 1500
 DEG_PER_US_270 = 270.0 / 2000.0
 DEG_PER_US_180 = 180.0 / 2000.0
 
+# Signed per-joint scale (inversion folded in), indexed by servo
+# V4 code: "if (index == 3) angle = deltaPulse * SCALE_180; else ... SCALE_270"
+# V4 Inversion: if (index == 2) return -angle; // J3 Inverted
+JOINT_DEG_PER_US = [DEG_PER_US_270, DEG_PER_US_270, -DEG_PER_US_270, DEG_PER_US_180]
+
+def encode_servo_frame(pulses):
+    # pulses: {servo_idx: pulse_width} -> b"s1-1500\ns3-1620\n" (ordered by servo)
+    # One growing buffer, no intermediate strings/lists.
+    frame = bytearray()
+    for servo_idx in sorted(pulses):
+        frame += SERVO_CMD_PREFIXES[servo_idx]
+        frame += b"%d\n" % pulses[servo_idx]
+    return bytes(frame)
+
 class RobotArmApp:
     def __init__(self, root):
         self.root = root
@@ -45,39 +81,134 @@ class RobotArmApp:
         self.serial_port = None
         self.is_connected = False
         
+        # Serial TX runs on its own thread so a slow USB adapter never freezes the UI
+        self.tx_queue = None
+        self.tx_thread = None
+        # (callback, arg) posted by the TX thread, run on the Tk thread by poll_tx_status
+        self.tx_status = queue.Queue()
+        self.tx_status_id = None
+        # True from a write timeout until the next successful write (log the stall once)
+        self.tx_stalled = False
+        
         self.servo_values = [tk.IntVar(value=1500) for _ in range(4)]
+        # Python-side copy of the slider pulses, updated from the Scale callback,
+        # so hot paths don't call IntVar.get() (a Tcl round-trip) per servo
+        self.current_pulses = [1500] * 4
         self.last_sent_values = [1500] * 4
+        self.update_id = None # Pending root.after id of the coalesced update tick
         
         # Trims (to calibrate 0 degrees to 1500us or other)
         # Based on V4 code: {0, -50, 0, 0}
         self.trims = [0, -50, 0, 0] 
+        # Pulse giving 0 deg per joint, precomputed for get_angle_deg
+        self.joint_centers = [NEUTRAL + trim for trim in self.trims]
+        
+        # Last text pushed to each label (skip Tk updates when unchanged)
+        self.label_texts = {}
+        # Pulses the kinematics display was last computed for
+        self.last_fk_pulses = None
+        # Per joint: (cos, sin) of its angle for every integer pulse PULSE_MIN..PULSE_MAX
+        self.joint_trig = [self.build_trig_table(i) for i in range(4)]
+        
+        # Log lines waiting to be inserted into the ScrolledText
+        self.log_ui_buffer = deque(maxlen=LOG_UI_BUFFER)
+        self.log_flush_id = None
+        # Log file lines go through log_queue to the writer thread (file IO off the Tk thread)
+        self.log_queue = None
+        self.log_thread = None
+        # "HH:MM:SS" of the current second, reused by log_message timestamps
+        self.log_ts_sec = None
+        self.log_ts_str = ""
+        # Latest sent pulse per servo not yet logged (see flush_servo_log)
+        self.servo_log_pending = {}
+        self.servo_log_id = None
+        # Pulse last written to the log per servo (TX retries resend, but are not new moves)
+        self.servo_log_last = [None] * 4
+        
+        # Serial port enumeration cache: (time.monotonic() of scan, [devices])
+        self.port_cache = (None, [])
 
         self.setup_ui()
         self.setup_logging()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
-        # Start kinematics update loop
-        self.update_kinematics_loop()
+        # Initial kinematics display (afterwards updated on slider change only)
+        self.update_kinematics(list(self.current_pulses))
 
     def setup_logging(self):
         if not os.path.exists(LOG_DIR):
             os.makedirs(LOG_DIR)
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file_path = os.path.join(LOG_DIR, f"robot_log_{timestamp}.txt")
+        # Kept open for the whole session (no open/close per line), owned by the writer thread
+        log_file = open(self.log_file_path, "a")
+        self.log_queue = queue.Queue()
+        self.log_thread = threading.Thread(target=self.log_worker, args=(log_file, self.log_queue), daemon=True)
+        self.log_thread.start()
         self.log_message(f"Session started: {timestamp}")
 
     def log_message(self, msg):
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        # Format HH:MM:SS once per second, only the milliseconds change in between
+        now = time.time()
+        sec = int(now)
+        if sec != self.log_ts_sec:
+            self.log_ts_sec = sec
+            self.log_ts_str = time.strftime("%H:%M:%S", time.localtime(sec))
+        timestamp = f"{self.log_ts_str}.{int((now - sec) * 1000):03d}"
         full_msg = f"[{timestamp}] {msg}"
         
-        # UI Log
+        # UI Log (batched, see flush_log_ui)
+        self.log_ui_buffer.append(full_msg)
+        if self.log_flush_id is None:
+            self.log_flush_id = self.root.after(LOG_UI_FLUSH_MS, self.flush_log_ui)
+        
+        # File Log (written by log_worker)
+        self.log_queue.put(full_msg + "\n")
+
+    def log_worker(self, log_file, log_queue):
+        # Runs on the log thread. Writes whatever is queued, then flushes once.
+        running = True
+        while running:
+            lines = [log_queue.get()]
+            while True:
+                try:
+                    lines.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in lines:
+                running = False
+                lines = lines[:lines.index(None)]
+            try:
+                log_file.write("".join(lines))
+                log_file.flush()
+            except OSError:
+                pass
+        log_file.close()
+
+    def on_close(self):
+        if self.is_connected:
+            self.toggle_connection()
+        self.log_message("Session ended")
+        self.log_queue.put(None)
+        self.log_thread.join(timeout=1.0)
+        self.root.destroy()
+
+    def flush_log_ui(self):
+        # One insert for all buffered lines instead of 4 Tcl calls per line
+        self.log_flush_id = None
+        if not self.log_ui_buffer:
+            return
+        batch = "".join(line + "\n" for line in self.log_ui_buffer)
+        self.log_ui_buffer.clear()
         self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, full_msg + "\n")
+        self.log_text.insert(tk.END, batch)
+        # Trim from the top so redraw cost stays bounded in long sessions
+        # (text ends with "\n", so 'end-1c' sits on an empty line after the last one)
+        lines = int(self.log_text.index('end-1c').split('.')[0]) - 1
+        if lines > LOG_UI_MAX_LINES:
+            self.log_text.delete('1.0', f'{lines - LOG_UI_MAX_LINES + 1}.0')
         self.log_text.see(tk.END)
         self.log_text.config(state='disabled')
-        
-        # File Log
-        with open(self.log_file_path, "a") as f:
-            f.write(full_msg + "\n")
 
     def setup_ui(self):
         # --- Connection Frame ---
@@ -90,7 +221,7 @@ class RobotArmApp:
         self.btn_connect = ttk.Button(conn_frame, text="Connect", command=self.toggle_connection)
         self.btn_connect.pack(side="left", padx=5)
         
-        self.btn_refresh = ttk.Button(conn_frame, text="Refresh Ports", command=lambda: self.port_combo.config(values=self.get_serial_ports()))
+        self.btn_refresh = ttk.Button(conn_frame, text="Refresh Ports", command=lambda: self.port_combo.config(values=self.get_serial_ports(force=True)))
         self.btn_refresh.pack(side="left", padx=5)
 
         # --- Control Frame ---
@@ -105,8 +236,9 @@ class RobotArmApp:
             lbl.pack(side="left")
             
             # Slider
-            scale = ttk.Scale(frame, from_=500, to=2500, variable=self.servo_values[i], orient="horizontal", command=lambda v, idx=i: self.on_slider_change(idx, v))
+            scale = ttk.Scale(frame, from_=PULSE_MIN, to=PULSE_MAX, variable=self.servo_values[i], orient="horizontal", command=lambda v, idx=i: self.on_slider_change(idx, v))
             scale.pack(side="left", fill="x", expand=True, padx=5)
+            scale.bind("<ButtonRelease-1>", lambda e, idx=i: self.on_slider_release(idx))
             
             # Value Label
             val_lbl = ttk.Label(frame, textvariable=self.servo_values[i], width=6)
@@ -129,8 +261,13 @@ class RobotArmApp:
         self.log_text = scrolledtext.ScrolledText(log_frame, state='disabled', height=10)
         self.log_text.pack(fill="both", expand=True, padx=5, pady=5)
 
-    def get_serial_ports(self):
-        return [comport.device for comport in serial.tools.list_ports.comports()]
+    def get_serial_ports(self, force=False):
+        scanned_at, ports = self.port_cache
+        now = time.monotonic()
+        if force or scanned_at is None or now - scanned_at > PORT_CACHE_TTL:
+            ports = [comport.device for comport in serial.tools.list_ports.comports()]
+            self.port_cache = (now, ports)
+        return ports
 
     def toggle_connection(self):
         if not self.is_connected:
@@ -139,77 +276,231 @@ class RobotArmApp:
                 self.log_message("Error: No port selected")
                 return
             try:
-                self.serial_port = serial.Serial(port, BAUD_RATE, timeout=0.1)
+                self.serial_port = serial.Serial(port, BAUD_RATE, timeout=0.1, write_timeout=WRITE_TIMEOUT)
+                try:
+                    # FTDI-style adapters otherwise hold bytes up to 16ms (latency timer)
+                    self.serial_port.set_low_latency_mode(True)
+                except (AttributeError, NotImplementedError, ValueError, OSError):
+                    pass # Only available on Linux (pyserial >= 3.5) and if the driver supports it
+                self.tx_queue = queue.Queue(maxsize=TX_QUEUE_SIZE)
+                self.tx_thread = threading.Thread(target=self.tx_worker, args=(self.serial_port, self.tx_queue), daemon=True)
+                self.tx_thread.start()
+                self.tx_status_id = self.root.after(TX_STATUS_POLL_MS, self.poll_tx_status)
+                self.tx_stalled = False
                 self.is_connected = True
                 self.btn_connect.config(text="Disconnect")
                 self.log_message(f"Connected to {port}")
             except Exception as e:
                 self.log_message(f"Connection Failed: {e}")
+                # The cached list may be stale (device unplugged / replugged): rescan now
+                self.port_combo.config(values=self.get_serial_ports(force=True))
         else:
+            if self.tx_thread:
+                # Stop signal after the pending frames, folded into one so there is room
+                pending = self.drain_tx_queue()
+                if pending:
+                    self.tx_queue.put_nowait(pending)
+                self.tx_queue.put_nowait(None)
+                self.tx_thread.join(timeout=1.0)
+                self.tx_thread = None
+            if self.tx_status_id is not None:
+                self.root.after_cancel(self.tx_status_id)
+                self.tx_status_id = None
             if self.serial_port:
                 self.serial_port.close()
             self.is_connected = False
+            # Report anything the TX thread posted while stopping
+            self.drain_tx_status()
             self.btn_connect.config(text="Connect")
             self.log_message("Disconnected")
 
     def on_slider_change(self, index, value):
-        # Debounce or limit sending rate could be added here
-        pass
+        # value is the Scale position as a string, e.g. "1523.76" (same truncation as IntVar.get)
+        self.current_pulses[index] = int(float(value))
+        self.request_update()
+
+    def on_slider_release(self, index):
+        # The 5us deadband can leave the servo a few us short of where the slider
+        # was dropped: force the exact final value out once on release.
+        if self.current_pulses[index] != self.last_sent_values[index]:
+            self.last_sent_values[index] = -1
+            self.request_update()
+
+    def request_update(self):
+        # Coalesce bursts of slider events into one update tick
+        if TX_COALESCE_MS <= 0:
+            self.update_tick()
+        elif self.update_id is None:
+            self.update_id = self.root.after(TX_COALESCE_MS, self.update_tick)
+
+    def update_tick(self):
+        # Single scheduled callback: serial TX + kinematics display
+        self.update_id = None
+        current_pulses = list(self.current_pulses)
+        self.flush_servo_commands(current_pulses)
+        self.update_kinematics(current_pulses)
+
+    def flush_servo_commands(self, current_pulses):
+        # Send commands if changed significantly (simple optimization)
+        updates = []
+        for i in range(4):
+            if abs(current_pulses[i] - self.last_sent_values[i]) >= 5: # 5us deadband
+                updates.append((i, current_pulses[i]))
+                self.last_sent_values[i] = current_pulses[i]
+        self.send_commands(updates)
+        
+        # Logging every frame of a drag would flood the log: keep the latest per servo
+        if updates:
+            self.servo_log_pending.update(updates)
+            if self.servo_log_id is None:
+                self.servo_log_id = self.root.after(SERVO_LOG_MS, self.flush_servo_log)
+
+    def flush_servo_log(self):
+        self.servo_log_id = None
+        changed = [(i, p) for i, p in sorted(self.servo_log_pending.items()) if p != self.servo_log_last[i]]
+        self.servo_log_pending.clear()
+        if changed:
+            for i, p in changed:
+                self.servo_log_last[i] = p
+            self.log_message(", ".join(f"Servo {i+1} set to {p}" for i, p in changed))
+
+    def send_commands(self, updates):
+        # updates: list of (servo_idx, pulse_width)
+        # Only enqueues; the TX thread does the (possibly blocking) write.
+        if self.is_connected and self.tx_queue and updates:
+            try:
+                self.tx_queue.put_nowait(updates)
+            except queue.Full:
+                # Port is stalled: collapse everything queued into one frame, oldest
+                # first so the newest pulse per servo wins, and the Tk thread never blocks.
+                merged = self.drain_tx_queue()
+                merged.update(updates)
+                self.tx_queue.put_nowait(merged)
 
-    def send_command(self, servo_idx, pulse_width):
-        if self.is_connected and self.serial_port:
-            cmd = f"s{servo_idx+1}-{int(pulse_width)}\n"
+    def drain_tx_queue(self):
+        # Empties tx_queue (Tk thread only) into one {servo: pulse} dict, in FIFO order
+        merged = {}
+        while True:
             try:
-                self.serial_port.write(cmd.encode())
-                # self.log_message(f"TX: {cmd.strip()}") 
+                item = self.tx_queue.get_nowait()
+            except queue.Empty:
+                return merged
+            if item is not None:
+                merged.update(item)
+
+    def tx_worker(self, port, tx_queue):
+        # Runs on the TX thread. Never calls Tk, not even root.after (it waits for
+        # the main loop, which may itself be waiting in join): post to tx_status instead.
+        running = True
+        # A timed-out write may have sent part of a line (e.g. "s1-13"): start the
+        # next frame with "\n" so that fragment ends on its own (the firmware
+        # ignores the resulting empty line) instead of corrupting the retry.
+        resync = False
+        while running:
+            pending = {}
+            item = tx_queue.get()
+            # Drain everything queued meanwhile, keeping the latest pulse per servo
+            while True:
+                if item is None:
+                    running = False
+                else:
+                    pending.update(item)
+                try:
+                    item = tx_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if not pending:
+                continue
+            # All commands go out in a single write (one syscall / USB transfer).
+            # The firmware parses line by line, so several "sN-P\n" per frame is fine.
+            cmd = encode_servo_frame(pending)
+            if resync:
+                cmd = b"\n" + cmd
+            try:
+                port.write(cmd)
+                if resync:
+                    resync = False
+                    self.tx_status.put((self.on_tx_recovered, None))
+                # self.tx_status.put((self.log_message, f"TX: {cmd.decode().strip()}"))
                 # Uncomment above for verbose TX logging, but it might spam
+            except serial.SerialTimeoutException:
+                resync = True
+                self.tx_status.put((self.on_tx_timeout, list(pending)))
             except Exception as e:
-                self.log_message(f"TX Error: {e}")
+                self.tx_status.put((self.log_message, f"TX Error: {e}"))
+
+    def poll_tx_status(self):
+        self.tx_status_id = self.root.after(TX_STATUS_POLL_MS, self.poll_tx_status)
+        self.drain_tx_status()
+
+    def drain_tx_status(self):
+        while True:
+            try:
+                callback, arg = self.tx_status.get_nowait()
+            except queue.Empty:
+                return
+            callback(arg)
+
+    def on_tx_timeout(self, servo_indices):
+        # The frame was not (fully) written: forget what we "sent" so the next flush resends it
+        for i in servo_indices:
+            self.last_sent_values[i] = -1
+        # A back-pressured adapter times out every WRITE_TIMEOUT: log the stall once, not each retry
+        if not self.tx_stalled:
+            self.tx_stalled = True
+            self.log_message(f"TX Timeout (servos {', '.join(str(i+1) for i in servo_indices)}), retrying")
+        if self.is_connected:
+            self.request_update()
+
+    def on_tx_recovered(self, _):
+        if self.tx_stalled:
+            self.tx_stalled = False
+            self.log_message("TX recovered")
 
     def get_angle_deg(self, index, pulse):
         # Logic to convert Pulse (500-2500) to Angle (Degrees)
-        # Based on V4 Scale.
-        # Check if J3 is 180 or 270 (V4 says index 3 (J4) is 180-scale, others 270?)
-        # Wait, V4 code: "if (index == 3) angle = deltaPulse * SCALE_180; else ... SCALE_270"
-        # Index 3 in C++ is J4 (0,1,2,3).
-        
-        center = NEUTRAL + self.trims[index]
-        delta = pulse - center
-        
-        if index == 3: # J4
-            angle = delta * DEG_PER_US_180
-        else:
-            angle = delta * DEG_PER_US_270
-            
-        # V4 Inversion: if (index == 2) return -angle; // J3 Inverted in V4? (index 2 is J3)
-        if index == 2:
-            return -angle
-        return angle
+        # Based on V4 Scale (J4 is 180-scale, J3 inverted), see JOINT_DEG_PER_US.
+        return (pulse - self.joint_centers[index]) * JOINT_DEG_PER_US[index]
 
-    def update_kinematics_loop(self):
-        # 1. Read current slider targets
-        current_pulses = [v.get() for v in self.servo_values]
-        
-        # 2. Send commands if changed significantly (simple optimization)
-        for i in range(4):
-            if abs(current_pulses[i] - self.last_sent_values[i]) >= 5: # 5us deadband
-                self.send_command(i, current_pulses[i])
-                self.last_sent_values[i] = current_pulses[i]
-                self.log_message(f"Servo {i+1} set to {current_pulses[i]}")
+    def build_trig_table(self, index):
+        # Pulses are integer microseconds, so the whole range fits in a small table
+        table = []
+        for pulse in range(PULSE_MIN, PULSE_MAX + 1):
+            q = math.radians(self.get_angle_deg(index, pulse))
+            table.append((math.cos(q), math.sin(q)))
+        return table
+
+    def get_joint_trig(self, index, pulse):
+        # Table lookup instead of radians/cos/sin on every update
+        # (pulses are int(float(...)) of a Scale bounded to PULSE_MIN..PULSE_MAX)
+        return self.joint_trig[index][pulse - PULSE_MIN]
+
+    def set_label_text(self, label, text):
+        # Each config() is a Tcl round-trip + redraw, only do it on change
+        if self.label_texts.get(label) != text:
+            self.label_texts[label] = text
+            label.config(text=text)
 
-        # 3. Calculate Kinematics
+    def update_kinematics(self, current_pulses):
+        # Nothing moved (sub-us slider jitter, TX retry): display is already correct
+        if current_pulses == self.last_fk_pulses:
+            return
+        self.last_fk_pulses = current_pulses
+        
+        # Calculate Kinematics
         angles = [self.get_angle_deg(i, current_pulses[i]) for i in range(4)]
-        q_rad = [math.radians(a) for a in angles]
+        c1, s1 = self.get_joint_trig(0, current_pulses[0])
+        c2, s2 = self.get_joint_trig(1, current_pulses[1])
+        c3, s3 = self.get_joint_trig(2, current_pulses[2])
+        c4, s4 = self.get_joint_trig(3, current_pulses[3])
         
         # Update Angle Display
-        self.lbl_angles.config(text=f"Angles (deg): q1={angles[0]:.1f}, q2={angles[1]:.1f}, q3={angles[2]:.1f}, q4={angles[3]:.1f}")
+        self.set_label_text(self.lbl_angles, f"Angles (deg): q1={angles[0]:.1f}, q2={angles[1]:.1f}, q3={angles[2]:.1f}, q4={angles[3]:.1f}")
 
         # --- GEOMETRIC CALCULATION ---
         # Base frame: Z up, X forward, Y left (standard right hand rule)
         
-        # J1 Rotation (Yaw around Z)
-        q1 = q_rad[0]
-        c1, s1 = math.cos(q1), math.sin(q1)
+        # J1 Rotation (Yaw around Z): c1, s1
         
         # Position of Shoulder Pivot (J2) relative to Base Origin
         # J2_OFF contains standard offsets.
@@ -221,8 +512,7 @@ class RobotArmApp:
         y2 = J2_OFF[0] * s1 + J2_OFF[1] * c1
         z2 = H_BASE + J2_OFF[2]
         
-        # J2 Rotation (Pitch around local Y')
-        q2 = q_rad[1]
+        # J2 Rotation (Pitch around local Y'): c2, s2
         
         # J3 moves relative to J2. It's a pitch joint.
         # Pitch plane logic:
@@ -242,8 +532,8 @@ class RobotArmApp:
         # Vector J2->J3 (Length J3_OFF[2] = 120)
         # Rotated by q2 (Pitch).
         # Projects onto XY plane (radial ground distance) usually as L*sin(q2)
-        r_j2_j3 = J3_OFF[2] * math.sin(q2)
-        dz_j2_j3 = J3_OFF[2] * math.cos(q2)
+        r_j2_j3 = J3_OFF[2] * s2
+        dz_j2_j3 = J3_OFF[2] * c2
         
         # Add J3_OFF Y offset if exists (it is 0.0 in V4)
         # But J3_OFF[2] is the Z-length component.
@@ -253,10 +543,10 @@ class RobotArmApp:
         y3 = y2 + r_j2_j3 * s1
         z3 = z2 + dz_j2_j3
         
-        # J3 Rotation (Pitch)
-        q3 = q_rad[2]
-        # Total Pitch for next link
-        pitch_sum_j3 = q2 + q3
+        # J3 Rotation (Pitch): c3, s3
+        # Total Pitch for next link, q2 + q3 (angle-addition on the cached cos/sin)
+        c23 = c2 * c3 - s2 * s3
+        s23 = s2 * c3 + c2 * s3
         
         # Vector J3->J4
         # J4_OFF[0] is X offset (thickness?), J4_OFF[2] is Z/Length (93.85)
@@ -264,8 +554,8 @@ class RobotArmApp:
         # V4 code: j4_z = j3_z + (J4_OFF[2] * c23); -> c23 = cos(q2+q3)
         # This confirms 0 is aligned with previous vertical, or accumulated angle from vertical.
         
-        r_j3_j4 = J4_OFF[2] * math.sin(pitch_sum_j3)
-        dz_j3_j4 = J4_OFF[2] * math.cos(pitch_sum_j3)
+        r_j3_j4 = J4_OFF[2] * s23
+        dz_j3_j4 = J4_OFF[2] * c23
         
         # Also handle J4_OFF[0] (11.08). Is it perpendicular?
         # V4: j4_x = j3_x + (J4_OFF[0] * c1) ... 
@@ -283,8 +573,9 @@ class RobotArmApp:
         
         # J4 Rotation (User says "not a gripper").
         # If it's a 4th DOF Pitch link:
-        q4 = q_rad[3]
-        pitch_sum_j4 = pitch_sum_j3 + q4
+        # Total pitch q2 + q3 + q4
+        c234 = c23 * c4 - s23 * s4
+        s234 = s23 * c4 + c23 * s4
         
         # Vector J4->TCP
         # TCP_OFF[2] (45.6) is length.
@@ -292,8 +583,8 @@ class RobotArmApp:
         # V4 IGNORED q4 for pitch. We will INCLUDE it.
         # If J4 is indeed the 4th servo pitch:
         
-        r_j4_tcp = TCP_OFF[2] * math.sin(pitch_sum_j4)
-        dz_j4_tcp = TCP_OFF[2] * math.cos(pitch_sum_j4)
+        r_j4_tcp = TCP_OFF[2] * s234
+        dz_j4_tcp = TCP_OFF[2] * c234
         
         # Add TCP offsets
         # V4: TCP_OFF[1] * s1 ...
@@ -306,12 +597,10 @@ class RobotArmApp:
         zf = z4 + dz_j4_tcp
         
         # Update Labels
-        self.lbl_pos.config(text=f"X: {xf:.2f} | Y: {yf:.2f} | Z: {zf:.2f}")
+        self.set_label_text(self.lbl_pos, f"X: {xf:.2f} | Y: {yf:.2f} | Z: {zf:.2f}")
 
         # Store calculated pos for logging?
         # Maybe log only periodically or on request to avoid IO lag
-        
-        self.root.after(100, self.update_kinematics_loop) # 10Hz update
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
 from mpl_toolkits.mplot3d import Axes3D
+from math import radians, sin, cos
 import numpy as np
 
 # ==========================================
@@ -31,96 +32,56 @@ J4_TO_TIP_X = 0.0
 J4_TO_TIP_Y = 4.9
 J4_TO_TIP_Z = 45.6
 
-def get_rotation_matrix(axis, angle_deg):
-    rad = np.radians(angle_deg)
-    c = np.cos(rad)
-    s = np.sin(rad)
-    
-    if axis == 'x':
-        return np.array([
-            [1, 0, 0, 0],
-            [0, c, -s, 0],
-            [0, s, c, 0],
-            [0, 0, 0, 1]
-        ])
-    elif axis == 'y':
-        return np.array([
-            [c, 0, s, 0],
-            [0, 1, 0, 0],
-            [-s, 0, c, 0],
-            [0, 0, 0, 1]
-        ])
-    elif axis == 'z':
-        return np.array([
-            [c, -s, 0, 0],
-            [s, c, 0, 0],
-            [0, 0, 1, 0],
-            [0, 0, 0, 1]
-        ])
-
-def get_translation_matrix(x, y, z):
-    return np.array([
-        [1, 0, 0, x],
-        [0, 1, 0, y],
-        [0, 0, 1, z],
-        [0, 0, 0, 1]
-    ])
-
 def calculate_chain(q1, q2, q3, q4):
     # Points to plot: Origin, J2_loc, J3_loc, J4_loc, Tip_loc
-    points = []
+    # Closed-form expansion of Rz(q1) -> T12 -> Rx(q2) -> T23 -> Rx(q3) -> T34 -> Rz(q4) -> T4tip
+    # Only scalar sin/cos, no matrix products: the chain is allocation-bound, not compute-bound.
+    c1, s1 = cos(radians(q1)), sin(radians(q1))
+    c2, s2 = cos(radians(q2)), sin(radians(q2))
+    c4, s4 = cos(radians(q4)), sin(radians(q4))
+    # J2 and J3 both rotate about X, so Rx(q2) @ Rx(q3) = Rx(q2 + q3)
+    c23, s23 = cos(radians(q2 + q3)), sin(radians(q2 + q3))
     
     # 0. World Origin
-    T_world = np.eye(4)
-    points.append(T_world[:3, 3])
-    
-    # --- TRANSFORMATION CHAIN ---
-    
-    # 1. Base Rotation (J1) - Axis Z
-    R_j1 = get_rotation_matrix('z', q1)
-    
-    # 2. Move to J2 (Shoulder)
-    # The shift happens AFTER J1 rotation (it orbits)? 
-    # Or is the servo mounted ON the shift?
-    # User said: "base servo has a turntable... that has servo 2 mounted... shifted in Y"
-    # This implies the shift rotates WITH J1.
-    T_j1_j2 = get_translation_matrix(J1_TO_J2_X, J1_TO_J2_Y, J1_TO_J2_Z)
-    
-    # Current Matrix: World -> Rotate J1 -> Translate to J2
-    M_j2 = T_world @ R_j1 @ T_j1_j2
-    points.append(M_j2[:3, 3])
-    
-    # 3. Shoulder Rotation (J2) - Axis X
-    R_j2 = get_rotation_matrix('x', q2)
-    
-    # 4. Move to J3 (Elbow)
-    # "Shifted only vertically" (along the link)
-    T_j2_j3 = get_translation_matrix(0, 0, J2_TO_J3_LEN)
-    
-    M_j3 = M_j2 @ R_j2 @ T_j2_j3
-    points.append(M_j3[:3, 3])
-    
-    # 5. Elbow Rotation (J3) - Axis X
-    R_j3 = get_rotation_matrix('x', q3)
-    
-    # 6. Move to J4 (Wrist)
-    # "Move along Z, Y and X"
-    T_j3_j4 = get_translation_matrix(J3_TO_J4_X, J3_TO_J4_Y, J3_TO_J4_Z)
-    
-    M_j4 = M_j3 @ R_j3 @ T_j3_j4
-    points.append(M_j4[:3, 3])
-    
-    # 7. Wrist Rotation (J4) - Axis Z (Yaw)
+    x0, y0, z0 = 0.0, 0.0, 0.0
+    
+    # 1-2. Base Rotation (J1, axis Z) then move to J2 (Shoulder)
+    # The shift rotates WITH J1 (servo 2 sits on the turntable, shifted in Y)
+    x2 = c1 * J1_TO_J2_X - s1 * J1_TO_J2_Y
+    y2 = s1 * J1_TO_J2_X + c1 * J1_TO_J2_Y
+    z2 = J1_TO_J2_Z
+    
+    # 3-4. Shoulder Rotation (J2, axis X) then move to J3 (Elbow)
+    # "Shifted only vertically" (along the link): Rz(q1) @ Rx(q2) @ [0, 0, L]
+    x3 = x2 + J2_TO_J3_LEN * s1 * s2
+    y3 = y2 - J2_TO_J3_LEN * c1 * s2
+    z3 = z2 + J2_TO_J3_LEN * c2
+    
+    # 5-6. Elbow Rotation (J3, axis X) then move to J4 (Wrist)
+    # "Move along Z, Y and X": rotate offset by Rx(q2 + q3), then by Rz(q1)
+    u = c23 * J3_TO_J4_Y - s23 * J3_TO_J4_Z
+    w = s23 * J3_TO_J4_Y + c23 * J3_TO_J4_Z
+    x4 = x3 + c1 * J3_TO_J4_X - s1 * u
+    y4 = y3 + s1 * J3_TO_J4_X + c1 * u
+    z4 = z3 + w
+    
+    # 7-8. Wrist Rotation (J4, axis Z / Yaw) then move to Tip
     # User said: "servo 1 and 4 have rotational axis around Z"
-    R_j4 = get_rotation_matrix('z', q4)
-    
-    # 8. Move to Tip
-    T_j4_tip = get_translation_matrix(J4_TO_TIP_X, J4_TO_TIP_Y, J4_TO_TIP_Z)
-    
-    M_tip = M_j4 @ R_j4 @ T_j4_tip
-    points.append(M_tip[:3, 3])
+    tx = c4 * J4_TO_TIP_X - s4 * J4_TO_TIP_Y
+    ty = s4 * J4_TO_TIP_X + c4 * J4_TO_TIP_Y
+    u = c23 * ty - s23 * J4_TO_TIP_Z
+    w = s23 * ty + c23 * J4_TO_TIP_Z
+    xt = x4 + c1 * tx - s1 * u
+    yt = y4 + s1 * tx + c1 * u
+    zt = z4 + w
     
-    return np.array(points)
+    return np.array([
+        [x0, y0, z0],
+        [x2, y2, z2],
+        [x3, y3, z3],
+        [x4, y4, z4],
+        [xt, yt, zt]
+    ])
 
 # ==========================================
 # PLOTTING
@@ -140,32 +101,35 @@ s_q2 = Slider(ax_q2, 'J2 (Shldr X)', -180, 180, valinit=0)
 s_q3 = Slider(ax_q3, 'J3 (Elbow X)', -180, 180, valinit=0)
 s_q4 = Slider(ax_q4, 'J4 (Wrist Z)', -180, 180, valinit=0)
 
+# Fixed Plot Limits for stability (set once, the artists below are updated in place)
+LIMIT = 300
+ax.set_xlim(-LIMIT, LIMIT)
+ax.set_ylim(-LIMIT, LIMIT)
+ax.set_zlim(0, 400)
+ax.set_xlabel('X')
+ax.set_ylabel('Y')
+ax.set_zlabel('Z')
+
+# Bones (Blue Lines)
+bones_line, = ax.plot([0], [0], [0], '-o', linewidth=4, markersize=8, color='blue')
+# Joints (Red dots)
+joints_scat = ax.scatter([0], [0], [0], color='red')
+# Text Annotations
+labels = ['Base', 'J2', 'J3', 'J4', 'Tip']
+labels_txt = [ax.text(0, 0, 0, txt, fontsize=10) for txt in labels]
+
 def update(val):
-    ax.clear()
-    
-    # Fixed Plot Limits for stability
-    LIMIT = 300
-    ax.set_xlim(-LIMIT, LIMIT)
-    ax.set_ylim(-LIMIT, LIMIT)
-    ax.set_zlim(0, 400)
-    ax.set_xlabel('X')
-    ax.set_ylabel('Y')
-    ax.set_zlabel('Z')
-    
     # Calculate Chain
     q1, q2, q3, q4 = s_q1.val, s_q2.val, s_q3.val, s_q4.val
     pts = calculate_chain(q1, q2, q3, q4)
-    
-    # Plot Bones (Blue Lines)
-    ax.plot(pts[:,0], pts[:,1], pts[:,2], '-o', linewidth=4, markersize=8, color='blue')
-    
-    # Plot Joints (Red dots)
-    ax.scatter(pts[:,0], pts[:,1], pts[:,2], color='red')
-    
-    # Text Annotations
-    labels = ['Base', 'J2', 'J3', 'J4', 'Tip']
-    for i, txt in enumerate(labels):
-        ax.text(pts[i,0], pts[i,1], pts[i,2], txt, fontsize=10)
+    xs, ys, zs = pts[:,0], pts[:,1], pts[:,2]
+    
+    # Move the existing artists instead of ax.clear() + re-plotting everything
+    bones_line.set_data_3d(xs, ys, zs)
+    joints_scat._offsets3d = (xs, ys, zs)
+    for txt, p in zip(labels_txt, pts):
+        txt.set_position((p[0], p[1]))
+        txt.set_3d_properties(p[2], zdir=None)
 
     # Orientation (Draw local axes at Tip)
     # (Simplified for visual clarity - just showing position mostly)